@@ -14,23 +14,32 @@ Living SOC Analyzer v3.0 — QGIS 대화상자
 import os
 import sys
 import json
+import hashlib
+import functools
+import inspect
+import threading
 import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
-from qgis.PyQt.QtCore import Qt, QThread, pyqtSignal, QSettings
+from qgis.PyQt.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, QVariant,
+    pyqtSignal, QSettings,
+)
 from qgis.PyQt.QtWidgets import (
     QDialog, QTabWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QLineEdit, QPushButton, QTextEdit, QProgressBar,
+    QLabel, QLineEdit, QPushButton, QPlainTextEdit, QProgressBar,
     QGroupBox, QCheckBox, QSpinBox, QDoubleSpinBox, QComboBox,
     QFileDialog, QMessageBox, QTableWidget, QTableWidgetItem,
     QHeaderView, QWidget, QScrollArea, QSplitter, QFrame,
 )
 from qgis.core import (
-    QgsProject, QgsVectorLayer, QgsCoordinateReferenceSystem,
-    QgsGraduatedSymbolRenderer, QgsRendererRange, QgsSymbol,
-    QgsClassificationQuantile, QgsClassificationJenks,
-    QgsClassificationEqualInterval,
+    Qgis, QgsApplication, QgsMessageLog, QgsProject, QgsTask, QgsVectorLayer,
+    QgsCoordinateReferenceSystem,
+    QgsFeature, QgsField, QgsFields, QgsGeometry,
 )
 
 # ── modules/ 경로 등록 ──
@@ -39,341 +48,881 @@ MODULES_DIR = os.path.join(PLUGIN_DIR, "modules")
 if MODULES_DIR not in sys.path:
     sys.path.insert(0, MODULES_DIR)
 
+# ── 분석 의존성 (없으면 None → 해당 Phase 실행 시 오류 보고) ──
+_IMPORT_ERRORS = {}     # {모듈명: 불러오기 실패 예외} — _require 에서 연결
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError as e:
+    np = pd = None
+    _IMPORT_ERRORS["pandas"] = e
+try:
+    import geopandas as gpd
+except ImportError as e:
+    gpd = None
+    _IMPORT_ERRORS["geopandas"] = e
+try:
+    from pyogrio import write_dataframe
+except ImportError:
+    write_dataframe = None
+try:
+    from pyproj import Transformer
+except ImportError as e:
+    Transformer = None
+    _IMPORT_ERRORS["pyproj"] = e
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.spatial import cKDTree
+except ImportError as e:
+    csr_matrix = cKDTree = None
+    _IMPORT_ERRORS["scipy"] = e
+# modules/ 는 불러오는 중 어떤 예외가 나도 대화상자는 열리도록 함
+try:
+    import settings as cfg
+    from api_fetcher import APIFetcher
+    from data_processor import DataProcessor
+except Exception as e:
+    cfg = APIFetcher = DataProcessor = None
+    _IMPORT_ERRORS["settings/api_fetcher/data_processor"] = e
+try:
+    from spatial_fetcher import SpatialDataFetcher
+except Exception as e:
+    SpatialDataFetcher = None
+    _IMPORT_ERRORS["spatial_fetcher"] = e
+try:
+    from transport_fetcher import TransportFetcher
+except Exception as e:
+    TransportFetcher = None
+    _IMPORT_ERRORS["transport_fetcher"] = e
+try:
+    from analyzer import SpatialAnalyzer
+except Exception as e:
+    SpatialAnalyzer = None
+    _IMPORT_ERRORS["analyzer"] = e
+try:
+    from equity_typology import EquityTypologyAnalyzer
+except Exception as e:
+    EquityTypologyAnalyzer = None
+    _IMPORT_ERRORS["equity_typology"] = e
+try:
+    from statistical_validator import StatisticalValidator
+except Exception as e:
+    StatisticalValidator = None
+    _IMPORT_ERRORS["statistical_validator"] = e
+try:
+    from auto_report import AutoReportGenerator
+except Exception as e:
+    AutoReportGenerator = None
+    _IMPORT_ERRORS["auto_report"] = e
+try:
+    from rustpy_xlsxwriter import FastExcel     # Rust 기반 xlsx 작성 (선택)
+except ImportError:
+    FastExcel = None
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError as e:
+    requests = HTTPAdapter = None
+    _IMPORT_ERRORS["requests"] = e
+
+
+def _require(obj, name):
+    """모듈 로드 실패(None) 시 ImportError (원래 예외를 원인으로 연결)"""
+    if obj is None:
+        err = _IMPORT_ERRORS.get(name)
+        detail = f": {err}" if err is not None else ""
+        raise ImportError(f"{name} 모듈을 불러올 수 없습니다{detail}") from err
+    return obj
+
+
+def _make_session():
+    """공용 HTTP 세션 (연결 풀·TLS 세션 재사용)"""
+    session = requests.Session()
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, HTTPAdapter(
+            pool_connections=8, pool_maxsize=8, max_retries=0))
+    session.headers["User-Agent"] = "LivingSOC/3.0"
+    return session
+
+
+_SESSION = _make_session() if requests is not None else None
+
+
+def _cache_key(area_code, year, extra=""):
+    """캐시 파일명용 해시 키 (지역코드·연도·부가조건)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{area_code}|{year}|{extra}".encode("utf-8"))
+    return h.hexdigest()
+
+
+@contextmanager
+def _atomic_path(path):
+    """같은 폴더의 임시 경로를 넘겨주고 성공 시 os.replace — 중단 시 잘린 캐시 방지
+
+    임시 파일명은 원래 확장자를 유지 (.graphml.gz 등 확장자로 압축 판단)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(
+        f".tmp{os.getpid()}_{threading.get_ident()}_{path.name}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+
+
+def _atomic_write(path, writer):
+    """임시 파일에 writer(f) 로 기록 후 제자리로 교체"""
+    with _atomic_path(path) as tmp, open(tmp, "wb") as f:
+        writer(f)
+
+
+def _npz_array(a):
+    """npz 저장용 배열 — object 배열은 문자열로 (allow_pickle=False 로 읽도록)"""
+    a = np.asarray(a)
+    return a if a.dtype.kind in "iufbU" else a.astype(str)
+
+
+def _supported_kwargs(func, **kwargs):
+    """func 시그니처가 받는 키워드 인자만 추림 (modules/ 버전 차이 대응)"""
+    params = inspect.signature(func).parameters
+    if any(p.kind is p.VAR_KEYWORD for p in params.values()):
+        return kwargs
+    return {k: v for k, v in kwargs.items() if k in params}
+
+
+# category 로 바꿀 지역 키 컬럼 (그 밖의 문자열은 이후 단계의 fillna·대입을 위해 유지)
+_CATEGORY_COLS = ("sido", "sigungu", "sido_cd", "sgg_cd", "adm_cd")
+
+
+def _optimize_dtypes(df):
+    """API 응답 DataFrame 메모리 축소 (지역 키 → category, 수치 downcast)"""
+    if df is None or len(df) == 0:
+        return df
+    for c in _CATEGORY_COLS:
+        if c not in df.columns or df[c].dtype != object:
+            continue
+        try:
+            if df[c].nunique() / len(df) < 0.5:
+                df[c] = df[c].astype("category")
+        except TypeError:
+            pass    # list/dict 값 컬럼 (해시 불가) → 그대로 둠
+    # 문자열 값("1,200" 등)은 변환하지 않음 — 파싱은 DataProcessor 담당
+    # 좌표는 float64 유지 (지오코딩 결과 대입·투영 변환 정밀도)
+    for c in ("lon", "lat"):
+        if c in df.columns and pd.api.types.is_numeric_dtype(df[c]):
+            df[c] = df[c].astype(np.float64)
+    if "capacity" in df.columns and df["capacity"].dtype == np.float64:
+        df["capacity"] = pd.to_numeric(df["capacity"], downcast="float")
+    # 인구수 등 합산 대상 → int32 미만으로 줄이지 않음 (넘침 방지)
+    i32 = np.iinfo(np.int32)
+    for c in df.select_dtypes("int64").columns:
+        if len(df[c]) and i32.min <= df[c].min() and df[c].max() <= i32.max:
+            df[c] = df[c].astype(np.int32)
+    return df
+
+
+@dataclass
+class ODMatrix:
+    """OD 행렬 (SoA): float32 이동시간 행렬 + 시설/인구 ID 배열"""
+    __slots__ = ("values", "fac_ids", "pop_ids")
+    values: "np.ndarray"    # (시설 수, 인구지점 수) float32
+    fac_ids: "np.ndarray"   # 행 ID
+    pop_ids: "np.ndarray"   # 열 ID
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(df.to_numpy(dtype=np.float32, copy=False),
+                   df.index.to_numpy(), df.columns.to_numpy())
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+
+def _gpkg_write(gdf, path, layer, append=False):
+    """GeoPackage 레이어 저장 (pyogrio 일괄 쓰기, 없으면 to_file)"""
+    if write_dataframe is not None:
+        write_dataframe(gdf, path, layer=layer, driver="GPKG", append=append)
+    else:
+        gdf.to_file(path, driver="GPKG", layer=layer,
+                    mode="a" if append else "w")
+
+
+def _gdf_fingerprint(gdf):
+    """레이어 변경 여부 판별용 해시 (속성값 전체 + 전체 geometry WKB)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(gdf.shape).encode())
+    h.update(",".join(map(str, gdf.columns)).encode())
+    attrs = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    try:
+        row_hash = pd.util.hash_pandas_object(attrs, index=True)
+    except TypeError:   # list/dict 값 컬럼 → 문자열로 해시
+        row_hash = pd.util.hash_pandas_object(attrs.astype(str), index=True)
+    h.update(row_hash.to_numpy().tobytes())
+    for wkb in gdf.geometry.to_wkb():
+        h.update(wkb or b"")
+    return h.hexdigest()
+
+
+def _set_if_changed(s, key, val):
+    """QSettings 값이 바뀐 경우에만 기록 (레지스트리/파일 쓰기 최소화)"""
+    if str(s.value(key, "")) != str(val):
+        s.setValue(key, val)
+
+
+@contextmanager
+def _table_bulk_update(table):
+    """QTableWidget 일괄 갱신 동안 정렬·다시그리기 중지"""
+    sorting = table.isSortingEnabled()
+    table.setSortingEnabled(False)
+    table.setUpdatesEnabled(False)
+    try:
+        yield table
+    finally:
+        table.setUpdatesEnabled(True)
+        table.setSortingEnabled(sorting)
+
+
+def _catchments_csr(pop_tree, fac_xy, r):
+    """시설별 임계거리 r 내 인구지점 (CSR: indptr, indices, dist)
+
+    리스트의 리스트 대신 평탄한 배열 — 시설 j 의 이웃은
+    indices[indptr[j]:indptr[j + 1]], 거리는 dist 의 같은 구간
+    """
+    pairs = cKDTree(fac_xy).sparse_distance_matrix(
+        pop_tree, r, output_type="ndarray")
+    order = np.lexsort((pairs["j"], pairs["i"]))
+    indptr = np.zeros(len(fac_xy) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pairs["i"], minlength=len(fac_xy)),
+              out=indptr[1:])
+    return (indptr,
+            pairs["j"][order].astype(np.int32),
+            pairs["v"][order].astype(np.float32))
+
+
+def _queen_weights(gdf):
+    """폴리곤 인접(Queen) 행표준화 공간가중치 → scipy.sparse CSR (n, n)"""
+    rows, cols = gdf.sindex.query(gdf.geometry, predicate="touches")
+    n = len(gdf)
+    counts = np.bincount(rows, minlength=n)
+    data = 1.0 / counts[rows]
+    return csr_matrix((data, (rows, cols)), shape=(n, n))
+
 
 # ═════════════════════════════════════════════════
-# Worker Thread — 파이프라인 백그라운드 실행
+# Worker Task — 파이프라인 백그라운드 실행 (QgsTask)
 # ═════════════════════════════════════════════════
-class PipelineWorker(QThread):
-    """백그라운드 12단계 실행"""
-    progress = pyqtSignal(int, str)    # (%, 메시지)
+class PipelineCancelled(BaseException):
+    """단계 내부 취소 — Phase 별 except Exception 에 잡히지 않도록 BaseException"""
+
+
+class PipelineTask(QgsTask):
+    """백그라운드 12단계 실행 (QGIS 작업 관리자 — 협조적 취소)"""
+    progress_msg = pyqtSignal(int, str)  # (%, 메시지) — QgsTask.progress() 와 구분
     log_msg = pyqtSignal(str)
     phase_update = pyqtSignal(int, str)  # (phase 번호, 상태)
-    finished = pyqtSignal(dict)
+    result_ready = pyqtSignal(dict)
     error = pyqtSignal(str)
 
     def __init__(self, mode, settings):
-        super().__init__()
+        super().__init__("Living SOC 12단계 분석", QgsTask.CanCancel)
         self.mode = mode        # "full" | "collect" | "analyze" | "validate" | "report"
         self.settings = settings
-        self._is_cancelled = False
-
-    def cancel(self):
-        self._is_cancelled = True
+        self._result = {}
+        self._error = None
+        self._tr_w2k = None     # WGS84 → CRS_KOREA 변환기 (최초 사용 시 생성)
+        self._fac_xy = None     # 투영 좌표 (N, 2) — Phase 9~11 공용
+        self._pop_xy = None
+
+        # 로그 버퍼: 작업 스레드에서 쌓고 GUI 스레드 타이머(100ms)로 일괄 전송
+        self._log_buf = []
+        self._log_lock = threading.Lock()
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_logs)
+        self.begun.connect(self._log_timer.start)
+
+    def _emit_log(self, msg):
+        with self._log_lock:
+            self._log_buf.append(msg)
+
+    def _flush_logs(self):
+        with self._log_lock:
+            buf, self._log_buf = self._log_buf, []
+        if buf:
+            self.log_msg.emit("\n".join(buf))
+
+    def _set_progress(self, pct, msg):
+        self.setProgress(pct)
+        self.progress_msg.emit(pct, msg)
 
     def run(self):
         try:
             if self.mode == "full":
-                result = self._run_full()
+                self._result = self._run_full()
             elif self.mode == "collect":
-                result = self._run_collect()
+                self._result = self._run_collect()
             elif self.mode == "analyze":
-                result = self._run_analyze()
+                self._result = self._run_analyze()
             elif self.mode == "validate":
-                result = self._run_validate()
+                self._result = self._run_validate()
             elif self.mode == "report":
-                result = self._run_report()
-            else:
-                result = {}
-
-            if not self._is_cancelled:
-                self.finished.emit(result)
+                self._result = self._run_report()
+            return not self.isCanceled()
+        except PipelineCancelled:
+            self._emit_log("⚠ 사용자 요청으로 단계 도중 중단")
+            return False
         except Exception as e:
-            self.error.emit(f"{e}\n{traceback.format_exc()}")
+            self._error = f"{e}\n{traceback.format_exc()}"
+            return False
+
+    def finished(self, ok):
+        """run() 종료 후 GUI 스레드에서 호출"""
+        self._log_timer.stop()
+        self._flush_logs()
+        if self._error:
+            self.error.emit(self._error)
+        elif ok:
+            self.result_ready.emit(self._result)
 
     # ── Full Pipeline ──
     def _run_full(self):
         """12단계 전체 실행"""
-        self.log_msg.emit("=" * 60)
-        self.log_msg.emit("Living SOC 12단계 파이프라인 시작")
-        self.log_msg.emit(f"시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        self.log_msg.emit("=" * 60)
+        self._emit_log("=" * 60)
+        self._emit_log("Living SOC 12단계 파이프라인 시작")
+        self._emit_log(f"시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self._emit_log("=" * 60)
+
+        _require(pd, "pandas")
+        _require(cfg, "settings/api_fetcher/data_processor")
 
         # settings 모듈에 API 키 주입
-        import settings as cfg
         user_keys = self.settings.get("api_keys", {})
-        for k, v in user_keys.items():
-            if v:
-                cfg.API_KEYS[k] = v
+        cfg.API_KEYS.update({k: v for k, v in user_keys.items() if v})
 
         # 대상지역 설정
         target_areas = self.settings.get("target_areas", cfg.TARGET_AREAS)
         year = self.settings.get("year", cfg.ANALYSIS_YEAR)
         output_dir = self.settings.get("output_dir", cfg.OUTPUT_DIR)
         Path(output_dir).mkdir(parents=True, exist_ok=True)
+        cache_dir = Path(output_dir) / ".cache"
+        force_refresh = self.settings.get("force_refresh", False)
 
         # ---------- Phase 1~4: 데이터 수집 ----------
         self.phase_update.emit(1, "running")
-        self.progress.emit(3, "[Phase 1/12] 시설·인구 API 데이터 구득...")
-        self.log_msg.emit("\n[Phase 1/12] 시설·인구 API 데이터 구득")
+        self._set_progress(3, "[Phase 1/12] 시설·인구 API 데이터 구득...")
+        self._emit_log("\n[Phase 1/12] 시설·인구 API 데이터 구득")
 
-        from api_fetcher import APIFetcher
         fetcher = APIFetcher(api_keys=cfg.API_KEYS)
         facilities_raw = {}
         population_raw = None
 
+        # 시설 수집 (지역 × 시설유형 병렬 요청)
+        jobs = [((area_name, ftype), (area_info.get("code", ""), ftype))
+                for area_name, area_info in target_areas.items()
+                for ftype in cfg.FACILITY_TYPES]
+        # 모든 프레임이 같은 범주를 공유해야 concat 후에도 category 유지
+        area_dtype = pd.CategoricalDtype(list(target_areas))
+        ftype_dtype = pd.CategoricalDtype(list(cfg.FACILITY_TYPES))
+        fetched = {}
+        for (area_name, ftype), df, err in self._iter_concurrent(
+                fetcher.fetch_medical_facilities, jobs):
+            if err is not None:
+                self._emit_log(f"    {area_name} {ftype}: 실패 ({err})")
+            elif df is not None and len(df) > 0:
+                df = _optimize_dtypes(df)
+                df["area"] = pd.Series(
+                    area_name, index=df.index, dtype=area_dtype)
+                df["ftype"] = pd.Series(
+                    ftype, index=df.index, dtype=ftype_dtype)
+                fetched[(area_name, ftype)] = df
+                self._emit_log(f"    {area_name} {ftype}: {len(df)}건")
+        if self.isCanceled():
+            return {"cancelled": True}
+        # 완료 순서와 무관하게 지역·유형 순서 유지
+        for (area_name, ftype), _ in jobs:
+            if (area_name, ftype) in fetched:
+                facilities_raw[f"{area_name}_{ftype}"] = \
+                    fetched[(area_name, ftype)]
+
         for area_name, area_info in target_areas.items():
-            if self._is_cancelled:
+            if self.isCanceled():
                 return {"cancelled": True}
-            self.log_msg.emit(f"  → {area_name} ({area_info['code']})")
+            self._emit_log(f"  → {area_name} ({area_info['code']})")
             code = area_info.get("code", "")
 
-            # 시설 수집
-            for ftype in cfg.FACILITY_TYPES:
-                try:
-                    df = fetcher.fetch_medical_facilities(code, ftype)
-                    if df is not None and len(df) > 0:
-                        key = f"{area_name}_{ftype}"
-                        facilities_raw[key] = df
-                        self.log_msg.emit(f"    {ftype}: {len(df)}건")
-                except Exception as e:
-                    self.log_msg.emit(f"    {ftype}: 실패 ({e})")
-
             # 인구 수집
             try:
                 pop = fetcher.fetch_population(code, year)
                 if pop is not None:
-                    population_raw = pop
-                    self.log_msg.emit(f"    인구: {len(pop)}건")
+                    population_raw = _optimize_dtypes(pop)
+                    self._emit_log(f"    인구: {len(pop)}건")
             except Exception as e:
-                self.log_msg.emit(f"    인구 실패: {e}")
+                self._emit_log(f"    인구 실패: {e}")
 
         self.phase_update.emit(1, "done")
 
         # Phase 2: 데이터 표준화
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(2, "running")
-        self.progress.emit(12, "[Phase 2/12] 데이터 표준화...")
-        self.log_msg.emit("\n[Phase 2/12] 데이터 표준화")
+        self._set_progress(12, "[Phase 2/12] 데이터 표준화...")
+        self._emit_log("\n[Phase 2/12] 데이터 표준화")
 
-        from data_processor import DataProcessor
         processor = DataProcessor()
         facilities_merged = None
         try:
-            import pandas as pd
             dfs = [df for df in facilities_raw.values() if df is not None]
             if dfs:
-                facilities_merged = pd.concat(dfs, ignore_index=True)
+                facilities_merged = pd.concat(
+                    dfs, ignore_index=True, copy=False, sort=False)
+                # 프레임별 범주가 달라 object 로 풀린 컬럼은 다시 category 로
+                cat_cols = {c for df in dfs
+                            for c in df.select_dtypes("category").columns}
+                for c in cat_cols:
+                    if facilities_merged[c].dtype.name != "category":
+                        facilities_merged[c] = \
+                            facilities_merged[c].astype("category")
+                # float64 → float32 (메모리 절감, 좌표 제외)
+                for c in facilities_merged.select_dtypes("float64").columns:
+                    if c in ("lon", "lat"):
+                        continue
+                    facilities_merged[c] = pd.to_numeric(
+                        facilities_merged[c], downcast="float")
                 facilities_merged = processor.standardize_columns(
                     facilities_merged)
-                self.log_msg.emit(f"  통합 시설: {len(facilities_merged)}건")
+                self._emit_log(f"  통합 시설: {len(facilities_merged)}건")
         except Exception as e:
-            self.log_msg.emit(f"  표준화 실패: {e}")
+            self._emit_log(f"  표준화 실패: {e}")
         self.phase_update.emit(2, "done")
 
         # Phase 3: 좌표 보정
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(3, "running")
-        self.progress.emit(20, "[Phase 3/12] 좌표 보정...")
-        self.log_msg.emit("\n[Phase 3/12] 좌표 보정 (주소→좌표 지오코딩)")
+        self._set_progress(20, "[Phase 3/12] 좌표 보정...")
+        self._emit_log("\n[Phase 3/12] 좌표 보정 (주소→좌표 지오코딩)")
         if facilities_merged is not None:
             try:
-                facilities_merged = processor.geocode_missing(
-                    facilities_merged, api_keys=cfg.API_KEYS)
-                self.log_msg.emit(f"  좌표 보정 완료: {len(facilities_merged)}건")
+                if {"lon", "lat"} <= set(facilities_merged.columns):
+                    # 좌표가 없는 행만 지오코딩
+                    need_mask = facilities_merged[["lon", "lat"]] \
+                        .isna().any(axis=1)
+                    n_need = int(need_mask.sum())
+                    if n_need:
+                        geocoded = processor.geocode_missing(
+                            facilities_merged.loc[need_mask],
+                            api_keys=cfg.API_KEYS)
+                        # 인덱스로 맞춰 대입 (일부 행이 빠진 결과도 허용)
+                        need_idx = facilities_merged.index[need_mask]
+                        if not geocoded.index.isin(need_idx).all():
+                            if len(geocoded) != n_need:
+                                raise ValueError(
+                                    "지오코딩 결과 행을 원본과 맞출 수 없음")
+                            geocoded = geocoded.set_axis(need_idx)
+                        for c in ("lon", "lat"):
+                            facilities_merged.loc[geocoded.index, c] = \
+                                geocoded[c].astype(
+                                    facilities_merged[c].dtype)
+                    self._emit_log(
+                        f"  좌표 보정 완료: {n_need}건 지오코딩 "
+                        f"(전체 {len(facilities_merged)}건)")
+                else:
+                    facilities_merged = processor.geocode_missing(
+                        facilities_merged, api_keys=cfg.API_KEYS)
+                    self._emit_log(
+                        f"  좌표 보정 완료: {len(facilities_merged)}건")
             except Exception as e:
-                self.log_msg.emit(f"  좌표 보정 건너뜀: {e}")
+                self._emit_log(f"  좌표 보정 건너뜀: {e}")
         self.phase_update.emit(3, "done")
 
         # Phase 4: 용량 정규화
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(4, "running")
-        self.progress.emit(25, "[Phase 4/12] 용량 표준화 (Min-Max)...")
-        self.log_msg.emit("\n[Phase 4/12] 용량지표 Min-Max 정규화")
+        self._set_progress(25, "[Phase 4/12] 용량 표준화 (Min-Max)...")
+        self._emit_log("\n[Phase 4/12] 용량지표 Min-Max 정규화")
         if facilities_merged is not None:
             try:
                 facilities_merged = processor.normalize_capacity(
                     facilities_merged)
-                self.log_msg.emit("  용량 정규화 완료")
+                self._emit_log("  용량 정규화 완료")
             except Exception as e:
-                self.log_msg.emit(f"  정규화 건너뜀: {e}")
+                self._emit_log(f"  정규화 건너뜀: {e}")
         self.phase_update.emit(4, "done")
 
         # ---------- Phase 5~7: 공간·교통 데이터 ----------
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(5, "running")
-        self.progress.emit(33, "[Phase 5/12] 공간데이터 수집...")
-        self.log_msg.emit("\n[Phase 5/12] 공간데이터 수집 (행정경계·DEM·경사)")
+        self._set_progress(33, "[Phase 5/12] 공간데이터 수집...")
+        self._emit_log("\n[Phase 5/12] 공간데이터 수집 (행정경계·DEM·경사)")
         admin_gdf = None
         try:
-            from spatial_fetcher import SpatialDataFetcher
-            sp = SpatialDataFetcher(api_keys=cfg.API_KEYS)
-            for area_name, area_info in target_areas.items():
-                gdf = sp.fetch_admin_boundary(area_info["code"])
-                if gdf is not None:
-                    admin_gdf = gdf
-                    self.log_msg.emit(f"  {area_name} 행정경계: {len(gdf)}개 읍면동")
+            sp = _require(SpatialDataFetcher, "spatial_fetcher")(
+                api_keys=cfg.API_KEYS)
+            jobs = [(area_name, (area_info["code"],))
+                    for area_name, area_info in target_areas.items()]
+            fetched = {}
+            for area_name, gdf, err in self._iter_concurrent(
+                    sp.fetch_admin_boundary, jobs):
+                if err is not None:
+                    self._emit_log(f"  {area_name} 행정경계 실패: {err}")
+                elif gdf is not None:
+                    fetched[area_name] = gdf
+                    self._emit_log(f"  {area_name} 행정경계: {len(gdf)}개 읍면동")
+            for area_name, _ in jobs:
+                admin_gdf = fetched.get(area_name, admin_gdf)
         except Exception as e:
-            self.log_msg.emit(f"  공간데이터 수집 실패: {e}")
+            self._emit_log(f"  공간데이터 수집 실패: {e}")
         self.phase_update.emit(5, "done")
 
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(6, "running")
-        self.progress.emit(40, "[Phase 6/12] 교통망 수집 (OSM)...")
-        self.log_msg.emit("\n[Phase 6/12] OSM 도로 네트워크 수집")
+        self._set_progress(40, "[Phase 6/12] 교통망 수집 (OSM)...")
+        self._emit_log("\n[Phase 6/12] OSM 도로 네트워크 수집")
         road_graph = None
         try:
-            from transport_fetcher import TransportFetcher
-            tf = TransportFetcher()
-            for area_name, area_info in target_areas.items():
-                G = tf.fetch_osm_network(area_info["code"])
+            tf = _require(TransportFetcher, "transport_fetcher")()
+
+            # 도로망 캐시: GraphML(gzip) — 실행 코드가 들어갈 수 없는 형식
+            try:
+                import osmnx as ox
+            except ImportError:
+                ox = None
+
+            def fetch_osm_cached(code):
+                if ox is None:      # 캐시 형식 변환 불가 → 매번 수집
+                    return tf.fetch_osm_network(code)
+                path = cache_dir / f"osm_{_cache_key(code, year)}.graphml.gz"
+                if path.exists() and not force_refresh:
+                    try:
+                        return ox.load_graphml(path)
+                    except Exception as e:
+                        self._emit_log(
+                            f"  캐시 손상 → 다시 수집: {path.name} ({e})")
+                        path.unlink()
+                G = tf.fetch_osm_network(code)
                 if G is not None:
-                    road_graph = G
-                    self.log_msg.emit(
+                    with _atomic_path(path) as tmp:
+                        ox.save_graphml(G, tmp)
+                return G
+
+            jobs = [(area_name, (area_info["code"],))
+                    for area_name, area_info in target_areas.items()]
+            fetched = {}
+            for area_name, G, err in self._iter_concurrent(
+                    fetch_osm_cached, jobs):
+                if err is not None:
+                    self._emit_log(f"  {area_name} 교통망 실패: {err}")
+                elif G is not None:
+                    fetched[area_name] = G
+                    self._emit_log(
                         f"  {area_name}: 노드 {G.number_of_nodes()}, "
                         f"링크 {G.number_of_edges()}")
+            for area_name, _ in jobs:
+                road_graph = fetched.get(area_name, road_graph)
         except Exception as e:
-            self.log_msg.emit(f"  교통망 수집 실패: {e}")
+            self._emit_log(f"  교통망 수집 실패: {e}")
         self.phase_update.emit(6, "done")
 
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(7, "running")
-        self.progress.emit(50, "[Phase 7/12] 카카오 OD 행렬...")
-        self.log_msg.emit("\n[Phase 7/12] 카카오맵 실제 이동시간 OD 행렬")
+        self._set_progress(50, "[Phase 7/12] 카카오 OD 행렬...")
+        self._emit_log("\n[Phase 7/12] 카카오맵 실제 이동시간 OD 행렬")
         od_matrix = None
+        od = None
         if cfg.API_KEYS.get("kakao_rest"):
             try:
-                from transport_fetcher import TransportFetcher
-                tf = TransportFetcher(api_keys=cfg.API_KEYS)
-                od_matrix = tf.build_kakao_od_matrix(
-                    facilities_merged, population_raw, sample_n=200)
+                sample_n = 200
+                fac_hash = ""
+                if facilities_merged is not None and \
+                   "lon" in facilities_merged.columns:
+                    fac_hash = hashlib.blake2b(
+                        pd.util.hash_pandas_object(
+                            facilities_merged[["lon", "lat"]],
+                            index=False).to_numpy().tobytes(),
+                        digest_size=8).hexdigest()
+                area_codes = ",".join(
+                    a["code"] for a in target_areas.values())
+                od_path = cache_dir / (
+                    f"od_{_cache_key(area_codes, year, f'{sample_n}|{fac_hash}')}"
+                    ".npz")
+                if od_path.exists() and not force_refresh:
+                    try:
+                        with np.load(od_path, allow_pickle=False) as z:
+                            od_matrix = pd.DataFrame(
+                                z["od"], index=z["idx"], columns=z["cols"])
+                        self._emit_log(f"  캐시 사용: {od_path.name}")
+                    except Exception as e:
+                        self._emit_log(
+                            f"  캐시 손상 → 다시 계산: {od_path.name} ({e})")
+                        od_path.unlink()
+                if od_matrix is None:
+                    tf = _require(TransportFetcher, "transport_fetcher")(
+                        api_keys=cfg.API_KEYS)
+                    od_matrix = tf.build_kakao_od_matrix(
+                        facilities_merged, population_raw, sample_n=sample_n,
+                        **self._kwargs_for(
+                            tf.build_kakao_od_matrix,
+                            progress_cb=self._on_od_progress))
+                    if od_matrix is not None:
+                        _atomic_write(od_path, lambda f: np.savez_compressed(
+                            f, od=od_matrix.to_numpy(),
+                            idx=_npz_array(od_matrix.index),
+                            cols=_npz_array(od_matrix.columns)))
                 if od_matrix is not None:
-                    self.log_msg.emit(f"  OD 행렬: {od_matrix.shape}")
+                    # float32 사본은 분석기가 od 를 받을 때만 (아니면 메모리만 추가)
+                    if SpatialAnalyzer is not None and \
+                       _supported_kwargs(SpatialAnalyzer, od=None):
+                        od = ODMatrix.from_frame(od_matrix)
+                    self._emit_log(f"  OD 행렬: {od_matrix.shape}")
             except Exception as e:
-                self.log_msg.emit(f"  OD 행렬 실패: {e}")
+                self._emit_log(f"  OD 행렬 실패: {e}")
         else:
-            self.log_msg.emit("  카카오 키 없음 → 직선거리 대체")
+            self._emit_log("  카카오 키 없음 → 직선거리 대체")
         self.phase_update.emit(7, "done")
 
         # Phase 8: 품질검증
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(8, "running")
-        self.progress.emit(58, "[Phase 8/12] 품질 검증...")
-        self.log_msg.emit("\n[Phase 8/12] 데이터 품질 검증 & 내보내기")
+        self._set_progress(58, "[Phase 8/12] 품질 검증...")
+        self._emit_log("\n[Phase 8/12] 데이터 품질 검증 & 내보내기")
         quality_report = {}
         if facilities_merged is not None:
             n_total = len(facilities_merged)
-            n_coords = facilities_merged[["lon", "lat"]].dropna().shape[0] \
+            n_coords = int(facilities_merged[["lon", "lat"]].notna()
+                           .all(axis=1).to_numpy().sum()) \
                 if "lon" in facilities_merged.columns else 0
             quality_report = {
                 "total_facilities": n_total,
                 "geocoded": n_coords,
                 "geocode_rate": round(n_coords / max(n_total, 1) * 100, 1),
             }
-            self.log_msg.emit(f"  시설 {n_total}건, 좌표확보 {n_coords}건 "
+            self._emit_log(f"  시설 {n_total}건, 좌표확보 {n_coords}건 "
                               f"({quality_report['geocode_rate']}%)")
 
-            # CSV 내보내기
-            csv_path = os.path.join(output_dir, "facilities_merged.csv")
-            facilities_merged.to_csv(csv_path, index=False, encoding="utf-8-sig")
-            self.log_msg.emit(f"  CSV 저장: {csv_path}")
+            # Parquet 내보내기 (pyarrow 없으면 CSV 대체)
+            export_csv = self.settings.get("export_csv", False)
+            pq_path = os.path.join(output_dir, "facilities_merged.parquet")
+            try:
+                facilities_merged.to_parquet(
+                    pq_path, engine="pyarrow", compression="zstd",
+                    index=False)
+                self._emit_log(f"  Parquet 저장: {pq_path}")
+            except Exception as e:
+                # pyarrow 미설치 또는 혼합형 object 컬럼(ArrowTypeError 등)
+                self._emit_log(f"  Parquet 저장 불가 ({e}) → CSV 저장")
+                if os.path.exists(pq_path):
+                    os.remove(pq_path)
+                export_csv = True
+            if export_csv:
+                csv_path = os.path.join(output_dir, "facilities_merged.csv")
+                facilities_merged.to_csv(
+                    csv_path, index=False, encoding="utf-8-sig")
+                self._emit_log(f"  CSV 저장: {csv_path}")
         self.phase_update.emit(8, "done")
 
         # ---------- Phase 9: E2SFCA 분석 ----------
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(9, "running")
-        self.progress.emit(65, "[Phase 9/12] E2SFCA 접근성 분석...")
-        self.log_msg.emit("\n[Phase 9/12] E2SFCA 접근성 + PPR + 유인력 + 혼잡도")
+        self._set_progress(65, "[Phase 9/12] E2SFCA 접근성 분석...")
+        self._emit_log("\n[Phase 9/12] E2SFCA 접근성 + PPR + 유인력 + 혼잡도")
         analysis_results = {}
         facilities_gdf = None
         population_gdf = None
 
         try:
-            import geopandas as gpd
-            from shapely.geometry import Point
-
-            if facilities_merged is not None and \
-               "lon" in facilities_merged.columns and \
-               "lat" in facilities_merged.columns:
-
-                valid = facilities_merged.dropna(subset=["lon", "lat"])
-                if len(valid) > 0:
-                    geometry = [Point(xy) for xy in
-                                zip(valid["lon"], valid["lat"])]
-                    facilities_gdf = gpd.GeoDataFrame(
-                        valid, geometry=geometry,
-                        crs=cfg.CRS_WGS84)
-                    facilities_gdf = facilities_gdf.to_crs(cfg.CRS_KOREA)
-
-            if population_raw is not None and \
-               "lon" in population_raw.columns:
-                valid_pop = population_raw.dropna(subset=["lon", "lat"])
-                if len(valid_pop) > 0:
-                    geom_p = [Point(xy) for xy in
-                              zip(valid_pop["lon"], valid_pop["lat"])]
-                    population_gdf = gpd.GeoDataFrame(
-                        valid_pop, geometry=geom_p,
-                        crs=cfg.CRS_WGS84)
-                    population_gdf = population_gdf.to_crs(cfg.CRS_KOREA)
+            _require(gpd, "geopandas")
+
+            facilities_gdf, self._fac_xy = self._points_gdf(facilities_merged)
+            population_gdf, self._pop_xy = self._points_gdf(population_raw)
 
             if facilities_gdf is not None and population_gdf is not None:
-                from analyzer import SpatialAnalyzer
+                _require(SpatialAnalyzer, "analyzer")
+
+                # 인구 중심점 KD-tree·집수구역은 분석기가 받을 때만 생성
+                wants = _supported_kwargs(
+                    SpatialAnalyzer, pop_tree=None, catchments=None)
+                pop_tree = catchments = None
+                threshold_m = self.settings.get("threshold_km", 30) * 1000
+                if wants:
+                    _require(cKDTree, "scipy")
+                    pop_tree = cKDTree(self._pop_xy)
+                if "catchments" in wants:
+                    catchments = _catchments_csr(
+                        pop_tree, self._fac_xy, threshold_m)
+
+                # numba 커널은 JIT 비용 때문에 분석 시점에만 로드
+                # (커널 입력은 위의 집수구역 CSR — 집수구역이 없으면 불필요)
+                kernel = None
+                if catchments is not None:
+                    try:
+                        from analyzer_kernels import HAS_NUMBA, e2sfca_kernel
+                        if HAS_NUMBA:
+                            # 분석 탭의 감쇠함수·β·임계거리를 미리 묶음
+                            # → kernel(indptr, indices, dist, S, P)
+                            kernel = functools.partial(
+                                e2sfca_kernel, d0=float(threshold_m),
+                                beta=self.settings.get("decay_beta", 1.0),
+                                decay_id=self.settings.get("decay_id", 0))
+                    except ImportError:
+                        pass
+
                 analyzer = SpatialAnalyzer(
                     facilities_gdf, population_gdf,
-                    od_matrix=od_matrix, road_graph=road_graph)
+                    od_matrix=od_matrix, road_graph=road_graph,
+                    **self._kwargs_for(SpatialAnalyzer,
+                                       od=od,
+                                       fac_xy=self._fac_xy,
+                                       pop_xy=self._pop_xy,
+                                       pop_tree=pop_tree,
+                                       catchments=catchments,
+                                       e2sfca_kernel=kernel,
+                                       cancel_cb=self._check_cancel))
                 analysis_results = analyzer.run_full_analysis()
-                self.log_msg.emit(
+                self._emit_log(
                     f"  분석 완료: {len(analysis_results)}개 시설유형")
             else:
-                self.log_msg.emit("  ⚠ GeoDataFrame 생성 실패 → 분석 건너뜀")
+                self._emit_log("  ⚠ GeoDataFrame 생성 실패 → 분석 건너뜀")
 
         except Exception as e:
-            self.log_msg.emit(f"  분석 오류: {e}")
-            self.log_msg.emit(traceback.format_exc())
+            self._emit_log(f"  분석 오류: {e}")
+            self._emit_log(traceback.format_exc())
+
+        # 내보내기 실패가 분석 결과에 영향을 주지 않도록 분석 뒤에 별도 저장
+        if facilities_gdf is not None:
+            try:
+                facilities_gdf.to_parquet(os.path.join(
+                    output_dir, "facilities.geoparquet"))
+            except Exception as e:
+                self._emit_log(f"  GeoParquet 저장 건너뜀: {e}")
         self.phase_update.emit(9, "done")
 
         # ---------- Phase 10: 형평성·유형화 ----------
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(10, "running")
-        self.progress.emit(78, "[Phase 10/12] 형평성·지역유형화...")
-        self.log_msg.emit("\n[Phase 10/12] 형평성(Gini·T검정) + K-means 유형화")
+        self._set_progress(78, "[Phase 10/12] 형평성·지역유형화...")
+        self._emit_log("\n[Phase 10/12] 형평성(Gini·T검정) + K-means 유형화")
         equity_results = {}
+        spatial_w = None
+        # 공간가중치는 Phase 10·11 분석기가 spatial_weights 를 받을 때만 생성
+        w_consumers = [c for c in (EquityTypologyAnalyzer, StatisticalValidator)
+                       if c is not None
+                       and _supported_kwargs(c, spatial_weights=None)]
+        if w_consumers and admin_gdf is not None and csr_matrix is not None:
+            try:
+                spatial_w = _queen_weights(admin_gdf)
+                self._emit_log(
+                    f"  공간가중치: {spatial_w.shape[0]}개 지역, "
+                    f"인접 {spatial_w.nnz}쌍")
+            except Exception as e:
+                self._emit_log(f"  공간가중치 생성 실패: {e}")
         try:
-            from equity_typology import EquityTypologyAnalyzer
             if analysis_results:
+                _require(EquityTypologyAnalyzer, "equity_typology")
+                # Bootstrap — 다항분포 가중치 행렬곱 (modules/stat_kernels)
+                try:
+                    from stat_kernels import (
+                        bootstrap_gini_multinomial, bootstrap_mean_multinomial)
+                except ImportError:
+                    bootstrap_gini_multinomial = None
+                    bootstrap_mean_multinomial = None
                 eq = EquityTypologyAnalyzer(
-                    analysis_results, admin_gdf=admin_gdf)
+                    analysis_results, admin_gdf=admin_gdf,
+                    **self._kwargs_for(
+                        EquityTypologyAnalyzer,
+                        n_boot=self.settings.get("boot_n", 1000),
+                        bootstrap_mean=bootstrap_mean_multinomial,
+                        bootstrap_gini=bootstrap_gini_multinomial,
+                        spatial_weights=spatial_w,
+                        cancel_cb=self._check_cancel))
                 equity_results = eq.run_full_analysis()
-                self.log_msg.emit("  형평성·유형화 완료")
+                self._emit_log("  형평성·유형화 완료")
         except Exception as e:
-            self.log_msg.emit(f"  형평성 분석 오류: {e}")
+            self._emit_log(f"  형평성 분석 오류: {e}")
         self.phase_update.emit(10, "done")
 
         # ---------- Phase 11: 통계검증 ----------
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(11, "running")
-        self.progress.emit(88, "[Phase 11/12] 통계검증...")
-        self.log_msg.emit("\n[Phase 11/12] Moran's I · Bootstrap · 민감도 분석")
+        self._set_progress(88, "[Phase 11/12] 통계검증...")
+        self._emit_log("\n[Phase 11/12] Moran's I · Bootstrap · 민감도 분석")
         validation_results = {}
         try:
-            from statistical_validator import StatisticalValidator
             if facilities_gdf is not None and analysis_results:
+                _require(StatisticalValidator, "statistical_validator")
+                # Moran's I 순열검정 — 순열 묶음 × W 행렬곱 (modules/stat_kernels)
+                try:
+                    from stat_kernels import moran_permutation_null
+                except ImportError:
+                    moran_permutation_null = None
                 sv = StatisticalValidator(
-                    facilities_gdf, population_gdf, analysis_results)
+                    facilities_gdf, population_gdf, analysis_results,
+                    **self._kwargs_for(
+                        StatisticalValidator,
+                        n_permutations=self.settings.get("perm_n", 999),
+                        moran_null=moran_permutation_null,
+                        n_boot=self.settings.get("boot_n", 1000),
+                        fac_xy=self._fac_xy,
+                        spatial_weights=spatial_w,
+                        cancel_cb=self._check_cancel))
                 validation_results = sv.run_full_validation()
                 grade = validation_results.get(
                     "종합_품질", {}).get("등급", "-")
-                self.log_msg.emit(f"  분석 품질 등급: {grade}")
+                self._emit_log(f"  분석 품질 등급: {grade}")
         except Exception as e:
-            self.log_msg.emit(f"  통계검증 오류: {e}")
+            self._emit_log(f"  통계검증 오류: {e}")
         self.phase_update.emit(11, "done")
 
         # ---------- Phase 12: 보고서 ----------
+        if self.isCanceled():
+            return {"cancelled": True}
         self.phase_update.emit(12, "running")
-        self.progress.emit(95, "[Phase 12/12] 자동보고서 생성...")
-        self.log_msg.emit(
+        self._set_progress(95, "[Phase 12/12] 자동보고서 생성...")
+        self._emit_log(
             "\n[Phase 12/12] Excel(9시트) + HTML대시보드 + JSON 생성")
         report_paths = {}
+        report_sizes = {}
         try:
-            from auto_report import AutoReportGenerator
-            rg = AutoReportGenerator(
+            rg_cls = _require(AutoReportGenerator, "auto_report")
+            rg = rg_cls(
                 analysis_results=analysis_results,
                 equity_results=equity_results,
                 validation_results=validation_results,
                 output_dir=output_dir,
+                **self._kwargs_for(
+                    rg_cls,
+                    excel_writer=FastExcel) if FastExcel else {},
             )
             report_paths = rg.generate_all()
             for fmt, path in report_paths.items():
-                self.log_msg.emit(f"  {fmt.upper()}: {path}")
+                self._emit_log(f"  {fmt.upper()}: {path}")
+                # 파일 크기는 작업 스레드에서 미리 확인 (GUI 스레드 stat 생략)
+                try:
+                    report_sizes[fmt] = os.stat(path).st_size
+                except OSError:
+                    pass
         except Exception as e:
-            self.log_msg.emit(f"  보고서 생성 오류: {e}")
+            self._emit_log(f"  보고서 생성 오류: {e}")
         self.phase_update.emit(12, "done")
 
         # 완료
-        self.progress.emit(100, "12단계 파이프라인 완료!")
-        self.log_msg.emit("\n" + "=" * 60)
-        self.log_msg.emit("✅ 12단계 파이프라인 완료!")
-        self.log_msg.emit(f"출력 위치: {output_dir}")
-        self.log_msg.emit("=" * 60)
+        self._set_progress(100, "12단계 파이프라인 완료!")
+        self._emit_log("\n" + "=" * 60)
+        self._emit_log("✅ 12단계 파이프라인 완료!")
+        self._emit_log(f"출력 위치: {output_dir}")
+        self._emit_log("=" * 60)
 
         return {
             "facilities_raw": facilities_raw,
@@ -385,33 +934,179 @@ class PipelineWorker(QThread):
             "equity_typology": equity_results,
             "validation": validation_results,
             "report_paths": report_paths,
+            "report_paths_sizes": report_sizes,
             "quality_report": quality_report,
             "output_dir": output_dir,
         }
 
+    _dropped_logged = set()     # 생략 인자 로그를 이미 남긴 호출 대상
+
+    def _kwargs_for(self, func, **kwargs):
+        """_supported_kwargs + 생략된 인자명을 QGIS 메시지 로그에 1회 기록"""
+        kw = _supported_kwargs(func, **kwargs)
+        dropped = sorted(set(kwargs) - set(kw))
+        name = getattr(func, "__qualname__", str(func))
+        if dropped and name not in PipelineTask._dropped_logged:
+            PipelineTask._dropped_logged.add(name)
+            QgsMessageLog.logMessage(
+                f"{name}: 지원하지 않는 인자 생략 ({', '.join(dropped)})",
+                "Living SOC", Qgis.Info)
+        return kw
+
+    def _wgs84_to_korea(self, lon, lat):
+        """경위도 배열 → CRS_KOREA 좌표 배열 (PROJ 일괄 변환)"""
+        if self._tr_w2k is None:
+            self._tr_w2k = _require(Transformer, "pyproj").from_crs(
+                cfg.CRS_WGS84, cfg.CRS_KOREA, always_xy=True)
+        return self._tr_w2k.transform(lon, lat)
+
+    def _points_gdf(self, df):
+        """lon/lat 보유 행 → (CRS_KOREA 점 GeoDataFrame, (N, 2) 좌표 배열)
+
+        좌표가 없으면 (None, None).
+        """
+        if df is None or not {"lon", "lat"} <= set(df.columns):
+            return None, None
+        mask = df[["lon", "lat"]].notna().all(axis=1).to_numpy()
+        if not mask.any():
+            return None, None
+        x, y = self._wgs84_to_korea(df["lon"].to_numpy()[mask],
+                                    df["lat"].to_numpy()[mask])
+        xy = np.ascontiguousarray(np.column_stack((x, y)), dtype=np.float64)
+        gdf = gpd.GeoDataFrame(df.loc[mask],
+                               geometry=gpd.points_from_xy(x, y),
+                               crs=cfg.CRS_KOREA)
+        return gdf, xy
+
+    def _check_cancel(self):
+        """장시간 단계 내부 콜백 — 취소 요청 시 PipelineCancelled"""
+        if self.isCanceled():
+            raise PipelineCancelled()
+
+    def _on_od_progress(self, done, total):
+        """OD 요청 진행 콜백 (수집 스레드에서 호출 → 시그널로 전달)"""
+        self._check_cancel()
+        if total and (done == total or done % 500 == 0):
+            self._emit_log(f"  OD 요청 {done}/{total}")
+
+    # ── 병렬 I/O ──
+    def _iter_concurrent(self, fn, jobs, max_workers=8):
+        """jobs=[(key, args), ...] 병렬 호출 → 완료 순으로 (key, 결과, 예외)"""
+        if not jobs:
+            return
+        ex = ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)))
+        try:
+            futures = {ex.submit(fn, *args): key for key, args in jobs}
+            for fut in as_completed(futures):
+                if self.isCanceled():
+                    break
+                err = fut.exception()
+                yield futures[fut], (None if err else fut.result()), err
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
+
     # ── 개별 Phase 실행 ──
     def _run_collect(self):
-        self.log_msg.emit("데이터 수집만 실행 (Phase 1~8)")
+        self._emit_log("데이터 수집만 실행 (Phase 1~8)")
         # 간략 버전 - full에서 phase 8까지만 수행
         return self._run_full()  # TODO: 개별 분리
 
     def _run_analyze(self):
-        self.log_msg.emit("접근성 분석만 실행 (Phase 9)")
+        self._emit_log("접근성 분석만 실행 (Phase 9)")
         return {}
 
     def _run_validate(self):
-        self.log_msg.emit("통계검증만 실행 (Phase 11)")
+        self._emit_log("통계검증만 실행 (Phase 11)")
         return {}
 
     def _run_report(self):
-        self.log_msg.emit("보고서 생성만 실행 (Phase 12)")
+        self._emit_log("보고서 생성만 실행 (Phase 12)")
         return {}
 
 
+# ═════════════════════════════════════════════════
+# GeoPackage 저장 작업 (QThreadPool)
+# ═════════════════════════════════════════════════
+class GpkgWriteSignals(QObject):
+    done = pyqtSignal(str, str)      # (경로, 레이어명)
+    failed = pyqtSignal(str, str)    # (레이어명, 오류)
+    all_done = pyqtSignal()
+
+
+class GpkgWriteTask(QRunnable):
+    """GeoPackage 레이어 저장 — 같은 파일(SQLite)은 한 작업에서 순차 저장"""
+
+    def __init__(self, path, layers):
+        super().__init__()
+        self.path = path
+        self.layers = layers        # [(레이어명, gdf), ...]
+        self.signals = GpkgWriteSignals()
+
+    def run(self):
+        # 레이어별 해시 사이드카 ({레이어명: 해시}) — 같으면 저장 생략
+        hash_path = Path(self.path + ".hash")
+        hashes = {}
+        if os.path.exists(self.path) and hash_path.exists():
+            try:
+                hashes = json.loads(hash_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                hashes = {}
+        for layer, gdf in self.layers:
+            try:
+                fp = _gdf_fingerprint(gdf)
+                if hashes.get(layer) != fp:
+                    _gpkg_write(gdf, self.path, layer)
+                    hashes[layer] = fp
+                self.signals.done.emit(self.path, layer)
+            except Exception as e:
+                hashes.pop(layer, None)
+                self.signals.failed.emit(layer, str(e))
+        try:
+            hash_path.write_text(json.dumps(hashes), encoding="utf-8")
+        except OSError:
+            pass
+        self.signals.all_done.emit()
+
+
+# ═════════════════════════════════════════════════
+# API 키 검증 작업 (QThreadPool)
+# ═════════════════════════════════════════════════
+class ApiCheckSignals(QObject):
+    done = pyqtSignal(dict)          # {라벨: 결과 문자열}
+
+
+class ApiCheckTask(QRunnable):
+    """API 키 검증 HTTP 요청 — 요청끼리도 병렬 실행"""
+
+    def __init__(self, probes):
+        super().__init__()
+        self.probes = probes        # [(라벨, 요청 함수), ...]
+        self.signals = ApiCheckSignals()
+
+    def run(self):
+        status = {}
+        try:
+            if self.probes:
+                with ThreadPoolExecutor(
+                        max_workers=len(self.probes)) as ex:
+                    futs = {ex.submit(fn): label
+                            for label, fn in self.probes}
+                    for f in as_completed(futs):
+                        try:
+                            ok = f.result().status_code == 200
+                            status[futs[f]] = "✅" if ok else "❌"
+                        except Exception:
+                            status[futs[f]] = "❌ (연결 실패)"
+        finally:
+            self.signals.done.emit(status)
+
+
 # ═════════════════════════════════════════════════
 # 메인 대화상자
 # ═════════════════════════════════════════════════
 class LivingSOCDialog(QDialog):
+    _PHASE_ICONS = {"running": "🔄 실행중...", "done": "✅ 완료",
+                    "error": "❌ 오류", "skip": "⏭ 건너뜀"}
 
     def __init__(self, iface, parent=None):
         super().__init__(parent)
@@ -420,7 +1115,18 @@ class LivingSOCDialog(QDialog):
         self.setMinimumSize(1020, 780)
         self.worker = None
         self.result = {}
+        self._gpkg_task = None      # 진행 중인 레이어 저장 작업
+        self._api_check_task = None  # 진행 중인 API 키 검증 작업
+        self._log_buffer = []       # 30ms 단위로 묶어 로그 창에 추가
+        self._log_flush_pending = False
         self._build_ui()
+
+        # _collect_settings 용 위젯 목록 (매 호출 재구성 방지)
+        self._api_items_tuple = tuple(self.api_inputs.items())
+        self._area_widgets = (
+            (self.area1_name, self.area1_code, self.area1_sido),
+            (self.area2_name, self.area2_code, self.area2_sido),
+        )
         self._load_settings()
 
     # ═════════════════════════════════════════
@@ -436,19 +1142,25 @@ class LivingSOCDialog(QDialog):
         self.tabs.addTab(self._build_tab_run(), "▶ 실행")
         self.tabs.addTab(self._build_tab_analysis(), "📊 분석")
         self.tabs.addTab(self._build_tab_validation(), "📈 검증")
-        self.tabs.addTab(self._build_tab_qgis(), "🗺 시각화")
-        self.tabs.addTab(self._build_tab_report(), "📋 보고서")
+        # 시각화·보고서 탭은 처음 열 때 생성 (빈 위젯으로 자리만 잡음)
+        self._tab_builders = {
+            4: (self._build_tab_qgis, "🗺 시각화"),
+            5: (self._build_tab_report, "📋 보고서"),
+        }
+        for i in sorted(self._tab_builders):
+            self.tabs.insertTab(i, QWidget(), self._tab_builders[i][1])
+        self.tabs.currentChanged.connect(self._ensure_tab)
         main_layout.addWidget(self.tabs)
 
         # 하단: 로그 + 진행률
         bottom = QGroupBox("실행 로그")
         bl = QVBoxLayout(bottom)
 
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setMaximumHeight(170)
         self.log_text.setStyleSheet(
-            "QTextEdit { font-family: 'Consolas','D2Coding','monospace'; "
+            "QPlainTextEdit { font-family: 'Consolas','D2Coding','monospace'; "
             "font-size: 11px; background: #1e1e1e; color: #d4d4d4; }")
         bl.addWidget(self.log_text)
 
@@ -465,6 +1177,21 @@ class LivingSOCDialog(QDialog):
 
         main_layout.addWidget(bottom)
 
+    def _ensure_tab(self, index):
+        """지연 생성 탭이면 실제 위젯으로 교체"""
+        entry = self._tab_builders.pop(index, None)
+        if entry is None:
+            return
+        builder, title = entry
+        current = self.tabs.currentIndex()
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, builder(), title)
+        self.tabs.setCurrentIndex(current)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
     # ────────────────────────────────────
     # Tab 0: 설정
     # ────────────────────────────────────
@@ -561,6 +1288,13 @@ class LivingSOCDialog(QDialog):
         btn_browse.clicked.connect(self._browse_output)
         og.addWidget(btn_browse, 1, 3)
 
+        self.chk_export_csv = QCheckBox("시설 통합자료 CSV 동시 저장")
+        og.addWidget(self.chk_export_csv, 2, 0, 1, 4)
+
+        self.chk_force_refresh = QCheckBox(
+            "캐시 무시 (OSM 교통망·OD 행렬 새로 수집)")
+        og.addWidget(self.chk_force_refresh, 3, 0, 1, 4)
+
         layout.addWidget(opt_group)
 
         # ── 시설유형 선택 ──
@@ -612,7 +1346,7 @@ class LivingSOCDialog(QDialog):
             "<table cellspacing='4'>"
             "<tr><td><b>Phase 1~4</b></td><td>시설·인구 API 수집 → 표준화 → 좌표보정 → 정규화</td></tr>"
             "<tr><td><b>Phase 5~7</b></td><td>공간데이터 + OSM 교통망 + 카카오 OD 행렬</td></tr>"
-            "<tr><td><b>Phase 8</b></td><td>데이터 품질검증 & CSV 내보내기</td></tr>"
+            "<tr><td><b>Phase 8</b></td><td>데이터 품질검증 & Parquet 내보내기</td></tr>"
             "<tr><td><b>Phase 9</b></td><td>E2SFCA 접근성 + PPR + 유인력 + 혼잡도 + 사각지대</td></tr>"
             "<tr><td><b>Phase 10</b></td><td>Gini계수 · T-검정 · K-means 지역유형화</td></tr>"
             "<tr><td><b>Phase 11</b></td><td>Moran's I · Bootstrap CI · 민감도 · LOOCV</td></tr>"
@@ -799,6 +1533,9 @@ class LivingSOCDialog(QDialog):
             cb.setChecked(True)
             ll.addWidget(cb)
             self.layer_checks[key] = cb
+        self.chk_memory_layer = QCheckBox(
+            "임시 메모리 레이어 (시설 분포를 GPKG 저장 없이 바로 등록)")
+        ll.addWidget(self.chk_memory_layer)
         layout.addWidget(lg)
 
         sg = QGroupBox("스타일")
@@ -886,13 +1623,10 @@ class LivingSOCDialog(QDialog):
     def _collect_settings(self):
         """현재 UI → dict"""
         api_keys = {k: inp.text().strip()
-                    for k, inp in self.api_inputs.items()}
+                    for k, inp in self._api_items_tuple}
 
         target_areas = {}
-        for name_w, code_w, sido_w in [
-            (self.area1_name, self.area1_code, self.area1_sido),
-            (self.area2_name, self.area2_code, self.area2_sido),
-        ]:
+        for name_w, code_w, sido_w in self._area_widgets:
             n = name_w.text().strip()
             c = code_w.text().strip()
             s = sido_w.text().strip()
@@ -909,6 +1643,13 @@ class LivingSOCDialog(QDialog):
             "target_areas": target_areas,
             "year": self.year_spin.value(),
             "output_dir": self.output_edit.text().strip(),
+            "export_csv": self.chk_export_csv.isChecked(),
+            "force_refresh": self.chk_force_refresh.isChecked(),
+            "threshold_km": self.threshold_spin.value(),
+            "decay_id": self.decay_combo.currentIndex(),
+            "decay_beta": self.decay_param.value(),
+            "perm_n": self.perm_spin.value(),
+            "boot_n": self.boot_spin.value(),
         }
 
     def _run_full_pipeline(self):
@@ -942,35 +1683,38 @@ class LivingSOCDialog(QDialog):
         self._start_worker(mode, settings)
 
     def _start_worker(self, mode, settings):
-        if self.worker and self.worker.isRunning():
+        if self.worker is not None:
             QMessageBox.warning(self, "실행 중",
                                 "이미 작업이 실행 중입니다.")
             return
 
+        self._log_buffer.clear()
         self.log_text.clear()
         self.progress_bar.setValue(0)
         self.btn_run.setEnabled(False)
         self.btn_stop.setEnabled(True)
 
         # Phase 테이블 초기화
-        for r in range(self.phase_table.rowCount()):
-            self.phase_table.setItem(r, 2, QTableWidgetItem("⏳ 대기"))
+        with _table_bulk_update(self.phase_table):
+            for r in range(self.phase_table.rowCount()):
+                self.phase_table.setItem(r, 2, QTableWidgetItem("⏳ 대기"))
 
-        self.worker = PipelineWorker(mode, settings)
-        self.worker.progress.connect(self._on_progress)
+        self.worker = PipelineTask(mode, settings)
+        self.worker.progress_msg.connect(self._on_progress)
         self.worker.log_msg.connect(self._on_log)
         self.worker.phase_update.connect(self._on_phase_update)
-        self.worker.finished.connect(self._on_finished)
+        self.worker.result_ready.connect(self._on_finished)
         self.worker.error.connect(self._on_error)
-        self.worker.start()
+        self.worker.taskCompleted.connect(self._reset_buttons)
+        self.worker.taskTerminated.connect(self._on_task_terminated)
+        QgsApplication.taskManager().addTask(self.worker)
 
     def _stop_pipeline(self):
-        if self.worker and self.worker.isRunning():
+        if self.worker is not None:
+            # 진행 중인 단계가 끝나는 지점에서 중단 (강제 종료 없음)
             self.worker.cancel()
-            self.worker.terminate()
-            self.worker.wait(3000)
-            self._log("⚠ 사용자에 의해 중단됨")
-            self._reset_buttons()
+            self.btn_stop.setEnabled(False)
+            self._log("⚠ 사용자에 의해 중단 요청됨")
 
     # ── 시그널 핸들러 ──
     def _on_progress(self, pct, msg):
@@ -983,37 +1727,46 @@ class LivingSOCDialog(QDialog):
     def _on_phase_update(self, phase_num, status):
         row = phase_num - 1
         if 0 <= row < self.phase_table.rowCount():
-            icons = {"running": "🔄 실행중...", "done": "✅ 완료",
-                     "error": "❌ 오류", "skip": "⏭ 건너뜀"}
-            self.phase_table.setItem(
-                row, 2, QTableWidgetItem(icons.get(status, status)))
+            text = self._PHASE_ICONS.get(status, status)
+            item = self.phase_table.item(row, 2)
+            if item is None:
+                self.phase_table.setItem(row, 2, QTableWidgetItem(text))
+            else:
+                item.setText(text)
 
     def _on_finished(self, result):
+        self.worker = None      # 아래 표시 중 예외가 나도 다음 실행은 가능하도록
         self.result = result
         self.progress_bar.setValue(100)
         self.status_label.setText("✅ 완료!")
 
         # 모든 Phase 완료 표시
-        for r in range(self.phase_table.rowCount()):
-            item = self.phase_table.item(r, 2)
-            if item and "대기" in item.text():
-                self.phase_table.setItem(
-                    r, 2, QTableWidgetItem("✅ 완료"))
+        with _table_bulk_update(self.phase_table):
+            for r in range(self.phase_table.rowCount()):
+                item = self.phase_table.item(r, 2)
+                if item and "대기" in item.text():
+                    item.setText(self._PHASE_ICONS["done"])
 
         # 보고서 테이블 업데이트
+        self._ensure_tab(5)
         paths = result.get("report_paths", {})
-        self.report_table.setRowCount(len(paths))
-        for i, (fmt, path) in enumerate(paths.items()):
-            self.report_table.setItem(i, 0, QTableWidgetItem(fmt.upper()))
-            self.report_table.setItem(
-                i, 1, QTableWidgetItem(os.path.basename(str(path))))
-            try:
-                size = os.path.getsize(str(path))
-                size_str = (f"{size/1024:.0f} KB" if size < 1024*1024
-                            else f"{size/1024/1024:.1f} MB")
-            except Exception:
-                size_str = "-"
-            self.report_table.setItem(i, 2, QTableWidgetItem(size_str))
+        sizes = result.get("report_paths_sizes", {})
+        with _table_bulk_update(self.report_table):
+            self.report_table.setRowCount(len(paths))
+            for i, (fmt, path) in enumerate(paths.items()):
+                self.report_table.setItem(
+                    i, 0, QTableWidgetItem(fmt.upper()))
+                self.report_table.setItem(
+                    i, 1, QTableWidgetItem(os.path.basename(str(path))))
+                try:
+                    size = sizes.get(fmt)
+                    if size is None:
+                        size = os.stat(path).st_size
+                    size_str = (f"{size/1024:.0f} KB" if size < 1024*1024
+                                else f"{size/1024/1024:.1f} MB")
+                except Exception:
+                    size_str = "-"
+                self.report_table.setItem(i, 2, QTableWidgetItem(size_str))
 
         # 검증 결과 테이블
         val = result.get("validation", {})
@@ -1030,10 +1783,11 @@ class LivingSOCDialog(QDialog):
                               f"{moran.get('I', '-'):.4f}"))
                 items.append(("p-value",
                               f"{moran.get('p_value', '-'):.4f}"))
-            self.val_table.setRowCount(len(items))
-            for i, (k, v) in enumerate(items):
-                self.val_table.setItem(i, 0, QTableWidgetItem(k))
-                self.val_table.setItem(i, 1, QTableWidgetItem(v))
+            with _table_bulk_update(self.val_table):
+                self.val_table.setRowCount(len(items))
+                for i, (k, v) in enumerate(items):
+                    self.val_table.setItem(i, 0, QTableWidgetItem(k))
+                    self.val_table.setItem(i, 1, QTableWidgetItem(v))
 
         self._reset_buttons()
         QMessageBox.information(
@@ -1051,12 +1805,32 @@ class LivingSOCDialog(QDialog):
             self, "오류",
             f"실행 중 오류가 발생했습니다.\n\n{msg[:600]}")
 
+    def _on_task_terminated(self):
+        # 오류 종료는 _on_error 에서 이미 처리 (worker 가 None)
+        if self.worker is not None and self.worker.isCanceled():
+            self._log("\n⏹ 중단됨")
+            self.status_label.setText("⏹ 중단됨")
+            self.progress_bar.setValue(0)
+        self._reset_buttons()
+
     def _reset_buttons(self):
+        self.worker = None      # 작업 관리자가 종료된 작업 객체를 삭제함
         self.btn_run.setEnabled(True)
         self.btn_stop.setEnabled(False)
 
     def _log(self, msg):
-        self.log_text.append(msg)
+        # 버퍼에 쌓고 30ms 뒤 한 번에 추가 (줄마다 재배치하지 않음)
+        self._log_buffer.append(msg)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            QTimer.singleShot(30, self._flush_log)
+
+    def _flush_log(self):
+        self._log_flush_pending = False
+        if not self._log_buffer:
+            return
+        self.log_text.appendPlainText("\n".join(self._log_buffer))
+        self._log_buffer.clear()
         sb = self.log_text.verticalScrollBar()
         sb.setValue(sb.maximum())
 
@@ -1070,62 +1844,133 @@ class LivingSOCDialog(QDialog):
                                 "먼저 ▶ 실행 탭에서 파이프라인을 실행해주세요.")
             return
 
-        project = QgsProject.instance()
+        if self._gpkg_task is not None:
+            QMessageBox.warning(self, "저장 중",
+                                "레이어 저장이 진행 중입니다.")
+            return
+
         output_dir = self.result.get("output_dir", "")
-        loaded = 0
 
-        # 시설 분포
+        # 등록할 레이어: (레이어명, gdf, 표시명, 완료 메시지)
+        layers = []
         if self.layer_checks.get("facilities", QCheckBox()).isChecked():
             gdf = self.result.get("facilities_gdf")
             if gdf is not None and hasattr(gdf, "to_file"):
-                try:
-                    path = os.path.join(output_dir, "시설분포.gpkg")
-                    gdf.to_file(path, driver="GPKG", layer="facilities")
-                    lyr = QgsVectorLayer(
-                        f"{path}|layername=facilities", "시설 분포", "ogr")
-                    if lyr.isValid():
-                        project.addMapLayer(lyr)
-                        loaded += 1
-                        self._log(f"✅ 시설 분포 ({len(gdf)}건)")
-                except Exception as e:
-                    self._log(f"⚠ 시설 레이어 실패: {e}")
-
-        # 행정경계
+                layers.append(("facilities", gdf, "시설 분포",
+                               f"✅ 시설 분포 ({len(gdf)}건)"))
         if self.layer_checks.get("admin", QCheckBox()).isChecked():
             gdf = self.result.get("admin_gdf")
             if gdf is not None and hasattr(gdf, "to_file"):
-                try:
-                    path = os.path.join(output_dir, "행정경계.gpkg")
-                    gdf.to_file(path, driver="GPKG", layer="admin")
-                    lyr = QgsVectorLayer(
-                        f"{path}|layername=admin", "행정경계", "ogr")
-                    if lyr.isValid():
-                        project.addMapLayer(lyr)
-                        loaded += 1
-                        self._log(f"✅ 행정경계 ({len(gdf)}개)")
-                except Exception as e:
-                    self._log(f"⚠ 행정경계 실패: {e}")
-
+                layers.append(("admin", gdf, "행정경계",
+                               f"✅ 행정경계 ({len(gdf)}개)"))
         # 유형화 결과 (CSV → 행정경계에 JOIN)
         if self.layer_checks.get("typology", QCheckBox()).isChecked():
             eq = self.result.get("equity_typology", {})
             if isinstance(eq, dict) and "typology_gdf" in eq:
                 gdf = eq["typology_gdf"]
                 if hasattr(gdf, "to_file"):
-                    try:
-                        path = os.path.join(output_dir, "지역유형화.gpkg")
-                        gdf.to_file(path, driver="GPKG", layer="typology")
-                        lyr = QgsVectorLayer(
-                            f"{path}|layername=typology", "지역 유형화", "ogr")
-                        if lyr.isValid():
-                            project.addMapLayer(lyr)
-                            loaded += 1
-                            self._log("✅ 지역 유형화")
-                    except Exception as e:
-                        self._log(f"⚠ 유형화 실패: {e}")
+                    layers.append(("typology", gdf, "지역 유형화",
+                                   "✅ 지역 유형화"))
+
+        self._layers_loaded = 0
+        self._written_layers = []   # 저장 완료 (경로, 레이어명) — 전체 완료 후 등록
+
+        # 시설 분포 → 메모리 레이어 (GPKG 저장 생략)
+        if layers and layers[0][0] == "facilities" and \
+           self.chk_memory_layer.isChecked():
+            _, gdf, title, done_msg = layers.pop(0)
+            try:
+                QgsProject.instance().addMapLayer(
+                    self._memory_point_layer(gdf, title))
+                self._layers_loaded += 1
+                self._log(done_msg)
+            except Exception as e:
+                self._log(f"⚠ {title} 레이어 실패: {e}")
+
+        if not layers:
+            self._on_gpkg_all_written()
+            return
 
-        self._log(f"\n총 {loaded}개 레이어 QGIS에 등록 완료")
-        if loaded > 0:
+        # 단일 GeoPackage 에 레이어별로 저장 (기존 동명 레이어는 덮어씀)
+        # 저장은 스레드풀, 레이어 등록은 GUI 스레드(시그널)에서 수행
+        self._layer_titles = {layer: (title, done_msg)
+                              for layer, _, title, done_msg in layers}
+        task = GpkgWriteTask(
+            os.path.join(output_dir, "results.gpkg"),
+            [(layer, gdf) for layer, gdf, _, _ in layers])
+        task.signals.done.connect(self._on_gpkg_layer_written)
+        task.signals.failed.connect(self._on_gpkg_layer_failed)
+        task.signals.all_done.connect(self._on_gpkg_all_written)
+        self._gpkg_task = task
+        self._log("🗺 레이어 저장 중...")
+        QThreadPool.globalInstance().start(task)
+
+    def _memory_point_layer(self, gdf, title):
+        """점 GeoDataFrame → memory provider 레이어 (피처 일괄 추가)"""
+        lyr = QgsVectorLayer(
+            f"Point?crs={gdf.crs.to_string()}", title, "memory")
+        prov = lyr.dataProvider()
+
+        attrs = [c for c in gdf.columns if c != gdf.geometry.name]
+        fields = QgsFields()
+        for c in attrs:
+            kind = gdf[c].dtype.kind
+            vtype = (QVariant.Double if kind == "f" else
+                     QVariant.LongLong if kind in "iu" else
+                     QVariant.Bool if kind == "b" else
+                     QVariant.DateTime if kind == "M" else QVariant.String)
+            fields.append(QgsField(str(c), vtype))
+        prov.addAttributes(fields)
+        lyr.updateFields()
+
+        # NaN/NaT/pd.NA → None (QGIS NULL) — NaN 그대로면 필터·통계 오류
+        # 날짜 → datetime (QDateTime), 기간 → 문자열 (Timestamp 는 변환 안 됨)
+        columns = []
+        for c in attrs:
+            col = gdf[c]
+            kind = col.dtype.kind
+            if kind == "M":
+                vals = pd.Series(np.array(col.dt.to_pydatetime(), dtype=object),
+                                 index=col.index, dtype=object)
+            elif kind == "m":
+                vals = col.astype(str).astype(object)
+            else:
+                vals = col.astype(object)
+            columns.append(vals.where(col.notna(), None).tolist())
+        feats = []
+        for wkb, row in zip(gdf.geometry.to_wkb(), zip(*columns)):
+            geom = QgsGeometry()
+            geom.fromWkb(wkb)
+            feat = QgsFeature(fields)
+            feat.setGeometry(geom)
+            feat.setAttributes(list(row))
+            feats.append(feat)
+        prov.addFeatures(feats)
+        lyr.updateExtents()
+        return lyr
+
+    def _on_gpkg_layer_written(self, path, layer):
+        # 작업이 같은 GPKG 에 다음 레이어를 쓰는 중이므로 여기서는 열지 않음
+        self._written_layers.append((path, layer))
+
+    def _on_gpkg_layer_failed(self, layer, msg):
+        title, _ = self._layer_titles[layer]
+        self._log(f"⚠ {title} 레이어 실패: {msg}")
+
+    def _on_gpkg_all_written(self):
+        self._gpkg_task = None
+        for path, layer in self._written_layers:
+            title, done_msg = self._layer_titles[layer]
+            lyr = QgsVectorLayer(f"{path}|layername={layer}", title, "ogr")
+            if lyr.isValid():
+                QgsProject.instance().addMapLayer(lyr)
+                self._layers_loaded += 1
+                self._log(done_msg)
+            else:
+                self._log(f"⚠ {title} 레이어를 열 수 없음: {path}|{layer}")
+        self._written_layers = []
+        self._log(f"\n총 {self._layers_loaded}개 레이어 QGIS에 등록 완료")
+        if self._layers_loaded > 0:
             self.iface.mapCanvas().refreshAllLayers()
 
     def _export_gpkg(self):
@@ -1145,9 +1990,7 @@ class LivingSOCDialog(QDialog):
             gdf = self.result.get(key)
             if gdf is not None and hasattr(gdf, "to_file"):
                 try:
-                    mode = "w" if saved == 0 else "a"
-                    gdf.to_file(filepath, driver="GPKG",
-                                layer=name, mode=mode)
+                    _gpkg_write(gdf, filepath, name)
                     saved += 1
                 except Exception as e:
                     self._log(f"⚠ {name} 저장 실패: {e}")
@@ -1162,16 +2005,18 @@ class LivingSOCDialog(QDialog):
 
     def _save_settings(self):
         s = QSettings("LivingSOC", "AnalyzerV3")
-        for key, inp in self.api_inputs.items():
-            s.setValue(f"api/{key}", inp.text())
-        s.setValue("area1_name", self.area1_name.text())
-        s.setValue("area1_code", self.area1_code.text())
-        s.setValue("area1_sido", self.area1_sido.text())
-        s.setValue("area2_name", self.area2_name.text())
-        s.setValue("area2_code", self.area2_code.text())
-        s.setValue("area2_sido", self.area2_sido.text())
-        s.setValue("year", self.year_spin.value())
-        s.setValue("output_dir", self.output_edit.text())
+        for key, inp in self._api_items_tuple:
+            _set_if_changed(s, f"api/{key}", inp.text())
+        _set_if_changed(s, "area1_name", self.area1_name.text())
+        _set_if_changed(s, "area1_code", self.area1_code.text())
+        _set_if_changed(s, "area1_sido", self.area1_sido.text())
+        _set_if_changed(s, "area2_name", self.area2_name.text())
+        _set_if_changed(s, "area2_code", self.area2_code.text())
+        _set_if_changed(s, "area2_sido", self.area2_sido.text())
+        _set_if_changed(s, "year", self.year_spin.value())
+        _set_if_changed(s, "output_dir", self.output_edit.text())
+        _set_if_changed(s, "export_csv", int(self.chk_export_csv.isChecked()))
+        s.sync()
         self._log("💾 설정 저장 완료 (QGIS 재시작 후에도 유지)")
         QMessageBox.information(self, "저장", "설정이 저장되었습니다.")
 
@@ -1195,46 +2040,47 @@ class LivingSOCDialog(QDialog):
         v = s.value("output_dir")
         if v:
             self.output_edit.setText(v)
+        v = s.value("export_csv")
+        if v is not None:
+            self.chk_export_csv.setChecked(bool(int(v)))
 
     def _check_api_keys(self):
         """등록된 API 키 유효성 간단 확인"""
-        import requests
-        results = []
-        keys = {k: inp.text().strip() for k, inp in self.api_inputs.items()}
+        if self._api_check_task is not None:
+            return
+        session = _require(_SESSION, "requests")
+        keys = {k: inp.text().strip() for k, inp in self._api_items_tuple}
+        self._api_check_order = ["공공데이터포털", "카카오 REST"]
+        probes = []     # (라벨, 요청 함수) — 미입력 키는 제외
 
         # 공공데이터포털
         if keys.get("data_go_kr"):
-            try:
-                r = requests.get(
-                    "http://apis.data.go.kr/B551182/hospInfoServicev2/"
-                    "getHospBasisList",
-                    params={"serviceKey": keys["data_go_kr"],
-                            "numOfRows": 1, "pageNo": 1},
-                    timeout=10)
-                ok = r.status_code == 200
-                results.append(f"공공데이터포털: {'✅' if ok else '❌'}")
-            except Exception:
-                results.append("공공데이터포털: ❌ (연결 실패)")
-        else:
-            results.append("공공데이터포털: ⚠ 미입력")
+            probes.append(("공공데이터포털", lambda: session.get(
+                "http://apis.data.go.kr/B551182/hospInfoServicev2/"
+                "getHospBasisList",
+                params={"serviceKey": keys["data_go_kr"],
+                        "numOfRows": 1, "pageNo": 1},
+                timeout=10)))
 
         # 카카오
         if keys.get("kakao_rest"):
-            try:
-                r = requests.get(
-                    "https://dapi.kakao.com/v2/local/search/keyword.json",
-                    headers={"Authorization":
-                             f"KakaoAK {keys['kakao_rest']}"},
-                    params={"query": "서울역"},
-                    timeout=10)
-                ok = r.status_code == 200
-                results.append(f"카카오 REST: {'✅' if ok else '❌'}")
-            except Exception:
-                results.append("카카오 REST: ❌ (연결 실패)")
-        else:
-            results.append("카카오 REST: ⚠ 미입력")
-
-        msg = "\n".join(results)
+            probes.append(("카카오 REST", lambda: session.get(
+                "https://dapi.kakao.com/v2/local/search/keyword.json",
+                headers={"Authorization": f"KakaoAK {keys['kakao_rest']}"},
+                params={"query": "서울역"},
+                timeout=10)))
+
+        task = ApiCheckTask(probes)
+        task.signals.done.connect(self._on_api_keys_checked)
+        self._api_check_task = task
+        self._log("\n🔍 API 키 검증 중...")
+        QThreadPool.globalInstance().start(task)
+
+    def _on_api_keys_checked(self, status):
+        self._api_check_task = None
+        msg = "\n".join(
+            f"{label}: {status.get(label, '⚠ 미입력')}"
+            for label in self._api_check_order)
         self._log(f"\n🔍 API 키 검증:\n{msg}")
         QMessageBox.information(self, "API 키 검증", msg)
 
@@ -6,12 +6,14 @@ QGIS 인터페이스 연결: 메뉴 등록, 툴바 아이콘, 대화상자 관
 =========================================================================
 """
 import os
+from qgis.PyQt.QtCore import QTimer
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
 
 
 class LivingSOCPlugin:
     """QGIS Plugin 메인 클래스"""
+    _icon = None    # 툴바 아이콘 (최초 1회만 로드)
 
     def __init__(self, iface):
         self.iface = iface
@@ -21,25 +23,45 @@ class LivingSOCPlugin:
         self.toolbar = self.iface.addToolBar("Living SOC Analyzer")
         self.toolbar.setObjectName("LivingSOCAnalyzerV3")
         self.dlg = None
+        self._gui_gen = 0   # initGui/unload 마다 증가 — 지난 타이머 무시용
+
+    def _plugin_icon(self):
+        if LivingSOCPlugin._icon is None:
+            icon_path = os.path.join(self.plugin_dir, "icons", "icon.png")
+            LivingSOCPlugin._icon = (QIcon(icon_path)
+                                     if os.path.exists(icon_path) else QIcon())
+        return LivingSOCPlugin._icon
 
     def initGui(self):
         """플러그인 GUI 초기화 (QGIS 시작 시 호출)"""
-        icon_path = os.path.join(self.plugin_dir, "icons", "icon.png")
-        icon = QIcon(icon_path) if os.path.exists(icon_path) else QIcon()
+        self._gui_gen += 1
+        gen = self._gui_gen
 
         # 메인: 분석 대시보드
-        self._add_action(icon, "Living SOC 분석 대시보드",
-                         self.run_main, add_toolbar=True)
+        self._add_action(self._plugin_icon(), "Living SOC 분석 대시보드",
+                         self.run_main, "LivingSOCMainAction",
+                         add_toolbar=True)
+
+        # 보조 메뉴는 QGIS 시작 직후로 미룸
+        QTimer.singleShot(500, lambda: self._add_secondary_actions(gen))
+
+    def _add_secondary_actions(self, gen):
+        # 타이머 실행 전 unload(또는 unload 후 재초기화)된 경우 건너뜀
+        if gen != self._gui_gen:
+            return
 
         # 빠른 실행: 전체 파이프라인
         self._add_action(QIcon(), "▶ 12단계 전체 실행",
-                         self.run_full_pipeline)
+                         self.run_full_pipeline, "LivingSOCRunFullAction")
 
         # 설정
-        self._add_action(QIcon(), "⚙ API 키 설정", self.run_settings)
+        self._add_action(QIcon(), "⚙ API 키 설정",
+                         self.run_settings, "LivingSOCSettingsAction")
 
-    def _add_action(self, icon, text, callback, add_toolbar=False):
+    def _add_action(self, icon, text, callback, object_name,
+                    add_toolbar=False):
         action = QAction(icon, text, self.iface.mainWindow())
+        action.setObjectName(object_name)
         action.triggered.connect(callback)
         self.iface.addPluginToMenu(self.menu, action)
         if add_toolbar:
@@ -48,9 +70,11 @@ class LivingSOCPlugin:
 
     def unload(self):
         """플러그인 제거"""
+        self._gui_gen += 1
         for action in self.actions:
             self.iface.removePluginMenu(self.menu, action)
             self.iface.removeToolBarIcon(action)
+        self.actions.clear()
         if self.toolbar:
             del self.toolbar
         self.dlg = None
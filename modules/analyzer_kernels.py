@@ -0,0 +1,73 @@
+"""
+=========================================================================
+Living SOC Analyzer - 수치 커널 (Numba JIT)
+=========================================================================
+E2SFCA 거리감쇠·공급/수요 비율 합산을 네이티브 루프로 계산
+  시설별 집수구역(CSR: indptr·indices·dist)만 순회 — 전체 쌍 계산 없음
+  decay_id: 0=Gaussian, 1=Exponential, 2=Inverse Power, 3=Linear, 4=Binary
+  (분석 탭 거리감쇠함수 콤보박스 순서와 동일 — settings["decay_id"])
+numba 미설치 시 같은 코드가 순수 파이썬으로 동작 (HAS_NUMBA=False)
+=========================================================================
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+@njit(cache=True, fastmath=True)
+def _decay(d, d0, beta, decay_id):
+    """거리 d (m) → 감쇠 가중치 (임계거리 d0 초과 시 0)"""
+    if d > d0:
+        return 0.0
+    if decay_id == 0:
+        r = d / d0
+        return math.exp(-beta * r * r)
+    if decay_id == 1:
+        return math.exp(-beta * d / d0)
+    if decay_id == 2:
+        return (1.0 + d / 1000.0) ** (-beta)
+    if decay_id == 3:
+        return 1.0 - d / d0
+    return 1.0
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def e2sfca_kernel(indptr, indices, dist, S, P, d0, beta, decay_id):
+    """E2SFCA 접근성 Ai (집수구역 CSR 기반)
+
+    indptr (M+1,), indices (nnz,), dist (nnz,): 시설 j 의 임계거리 내
+      인구지점·거리(m) — indices[indptr[j]:indptr[j+1]]
+    S (M,): 시설 공급량, P (N,): 인구
+    1단계 R_j = S_j / Σ_i P_i·f(d_ij), 2단계 A_i = Σ_j R_j·f(d_ij)
+    """
+    n_fac = indptr.shape[0] - 1
+    n_pop = P.shape[0]
+
+    R = np.zeros(n_fac, dtype=np.float32)
+    for j in prange(n_fac):
+        demand = 0.0
+        for k in range(indptr[j], indptr[j + 1]):
+            demand += P[indices[k]] * _decay(dist[k], d0, beta, decay_id)
+        if demand > 0.0:
+            R[j] = S[j] / demand
+
+    # 인구지점으로 흩뿌리는 합산 — 쓰기 경합을 피하려 순차 실행 (O(nnz))
+    A = np.zeros(n_pop, dtype=np.float32)
+    for j in range(n_fac):
+        if R[j] == 0.0:
+            continue
+        for k in range(indptr[j], indptr[j + 1]):
+            A[indices[k]] += R[j] * _decay(dist[k], d0, beta, decay_id)
+    return A
@@ -0,0 +1,69 @@
+"""
+=========================================================================
+Living SOC Analyzer - 통계 커널 (NumPy 벡터화)
+=========================================================================
+Moran's I 순열검정 : 순열 묶음을 (P, n) 행렬로 만들어 W 곱 한 번에 계산
+Bootstrap          : 재표집 대신 다항분포 가중치 행렬 M (B, n) 사용
+                     평균 = M @ y / n, Gini = 가중 로렌츠곡선 (cumsum)
+W 는 scipy.sparse 행렬 또는 (n, n) ndarray 모두 가능
+=========================================================================
+"""
+import numpy as np
+
+
+def moran_i(z, W):
+    """관측 Moran's I (z: 평균 제거된 값 (n,))"""
+    z = np.asarray(z, dtype=np.float64)
+    s0 = W.sum()
+    return len(z) / s0 * float(z @ (W @ z)) / float(z @ z)
+
+
+def moran_permutation_null(z, W, n_perm, rng, chunk=256):
+    """순열 귀무분포 I_perm (n_perm,)
+
+    z: 평균 제거된 값 (n,), W: 공간가중치 (n, n)
+    chunk 개 순열씩 (chunk, n) 인덱스 행렬 → Z_perm @ W 한 번
+    """
+    z = np.asarray(z, dtype=np.float64)
+    n = len(z)
+    scale = n / W.sum() / float(z @ z)
+    base = np.arange(n)
+    out = np.empty(n_perm, dtype=np.float64)
+    for start in range(0, n_perm, chunk):
+        b = min(chunk, n_perm - start)
+        idx = rng.permuted(np.broadcast_to(base, (b, n)), axis=1)
+        zp = z[idx]                                 # (b, n)
+        wz = np.asarray(W @ zp.T).T                 # (b, n) — 희소면 O(nnz·b)
+        out[start:start + b] = scale * np.einsum("pi,pi->p", zp, wz)
+    return out
+
+
+def _multinomial_weights(n, n_boot, rng):
+    """Bootstrap 재표집 횟수 행렬 M (n_boot, n) ~ Multinomial(n, 1/n)"""
+    return rng.multinomial(n, np.full(n, 1.0 / n), size=n_boot)
+
+
+def bootstrap_mean_multinomial(y, n_boot, rng):
+    """Bootstrap 평균 분포 (n_boot,) — M @ y / n"""
+    y = np.asarray(y, dtype=np.float64)
+    M = _multinomial_weights(len(y), n_boot, rng)
+    return (M @ y) / len(y)
+
+
+def bootstrap_gini_multinomial(y, n_boot, rng):
+    """Bootstrap Gini 분포 (n_boot,)
+
+    정렬된 y 와 표본별 가중치 w 로
+    G = Σ_i w_i (y_i·W_<i − S_<i) / (n · Σ w·y)
+    (W_<i, S_<i: i 앞까지 누적 가중치·누적 가중합)
+    """
+    y = np.sort(np.asarray(y, dtype=np.float64))
+    n = len(y)
+    M = _multinomial_weights(n, n_boot, rng).astype(np.float64)
+    My = M * y
+    w_before = np.cumsum(M, axis=1) - M
+    s_before = np.cumsum(My, axis=1) - My
+    num = np.einsum("bi,bi->b", M, y * w_before - s_before)
+    total = My.sum(axis=1)
+    return np.divide(num, n * total, out=np.zeros(n_boot),
+                     where=total > 0)
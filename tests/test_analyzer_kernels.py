@@ -0,0 +1,71 @@
+"""analyzer_kernels.e2sfca_kernel — 전체 쌍 NumPy 참조 구현과 비교"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "modules"))
+
+from analyzer_kernels import e2sfca_kernel  # noqa: E402
+
+
+def _decay_ref(d, d0, beta, decay_id):
+    if decay_id == 0:
+        w = np.exp(-beta * (d / d0) ** 2)
+    elif decay_id == 1:
+        w = np.exp(-beta * d / d0)
+    elif decay_id == 2:
+        w = (1.0 + d / 1000.0) ** (-beta)
+    elif decay_id == 3:
+        w = 1.0 - d / d0
+    else:
+        w = np.ones_like(d)
+    return np.where(d > d0, 0.0, w)
+
+
+def _e2sfca_ref(fac_xy, pop_xy, S, P, d0, beta, decay_id):
+    d = np.hypot(fac_xy[:, None, 0] - pop_xy[None, :, 0],
+                 fac_xy[:, None, 1] - pop_xy[None, :, 1])
+    w = _decay_ref(d, d0, beta, decay_id)
+    demand = w @ P
+    R = np.divide(S, demand, out=np.zeros_like(S), where=demand > 0)
+    return R @ w
+
+
+def _csr(fac_xy, pop_xy, d0):
+    d = np.hypot(fac_xy[:, None, 0] - pop_xy[None, :, 0],
+                 fac_xy[:, None, 1] - pop_xy[None, :, 1])
+    rows, cols = np.nonzero(d <= d0)
+    indptr = np.zeros(len(fac_xy) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(fac_xy)), out=indptr[1:])
+    return (indptr, cols.astype(np.int32),
+            d[rows, cols].astype(np.float32))
+
+
+@pytest.mark.parametrize("decay_id", [0, 1, 2, 3, 4])
+def test_matches_dense_reference(decay_id):
+    rng = np.random.default_rng(42)
+    fac_xy = rng.uniform(0, 20000, size=(15, 2))
+    pop_xy = rng.uniform(0, 20000, size=(60, 2))
+    S = rng.uniform(1, 50, size=15)
+    P = rng.integers(0, 5000, size=60).astype(np.float64)
+    d0, beta = 8000.0, 1.5
+
+    indptr, indices, dist = _csr(fac_xy, pop_xy, d0)
+    got = e2sfca_kernel(indptr, indices, dist, S, P, d0, beta, decay_id)
+    want = _e2sfca_ref(fac_xy, pop_xy, S, P, d0, beta, decay_id)
+
+    np.testing.assert_allclose(got, want, rtol=1e-4, atol=1e-9)
+
+
+def test_facility_without_catchment_contributes_nothing():
+    indptr = np.array([0, 0, 1], dtype=np.int64)    # 시설 0: 이웃 없음
+    indices = np.array([0], dtype=np.int32)
+    dist = np.array([0.0], dtype=np.float32)
+    S = np.array([10.0, 4.0])
+    P = np.array([2.0, 7.0])
+
+    got = e2sfca_kernel(indptr, indices, dist, S, P, 1000.0, 1.0, 4)
+
+    np.testing.assert_allclose(got, [2.0, 0.0])